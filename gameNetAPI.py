@@ -1,26 +1,65 @@
+import heapq
+import itertools
+import logging
+import math
+import os
+import queue
 import random
+import selectors
 import socket
+import struct
 import time
-from gameNetPacket import GameNetPacket
+from gameNetPacket import GameNetPacket, ACK_NUM_OFFSET, ACK_NUM_STRUCT, HEADER_SIZE, MAX_PACKET_SIZE, acquire_buffer, now_ms, release_buffer
+from gameNetBatch import CAN_DISCONNECT, RecvBatch, disconnect, send_batch
 import threading
 from collections import deque
-import json
 import signal
 import sys
 
+try:
+    # optional C-implemented lock with a fast uncontended path; works with threading.Condition
+    from fastrlock.rlock import FastRLock as _Lock
+except ImportError:
+    _Lock = threading.Lock
+
 # Selective Repeat parameters
-SR_WINDOW_SIZE = 16
+SR_WINDOW_SIZE = 16  # must be a power of two: window slots are indexed by seq & WINDOW_MASK
+WINDOW_MASK = SR_WINDOW_SIZE - 1
 BUFFER_SIZE = 1024
+RECV_BATCH_SIZE = 32  # max datagrams drained per recvmmsg call
 MAX_SEQ_NUM = 2 ** 16  # allow wrap for 16-bit sequence numbers
+SEQ_MASK = MAX_SEQ_NUM - 1  # x & SEQ_MASK == x % MAX_SEQ_NUM, as MAX_SEQ_NUM is a power of two
 
 # Client parameters
+SEND_BATCH_SIZE = 64  # max packets coalesced into a single sendmmsg call
 RETRANSMISSION_STOP_THRESHOLD = 0.2  # seconds | at which we give up retransmitting
-TIMEOUT = 0.05  # seconds | at which we retransmit packets
+TIMEOUT = 0.05  # seconds | at which we retransmit packets, until the first RTT sample arrives
+MIN_RTO = 0.02  # seconds | floor for the adaptive retransmission timeout
+POLL_TIMEOUT = 0.1  # seconds | max time a receive loop blocks before re-checking for shutdown
+
+# Socket parameters
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024  # bytes | kernel send/receive buffers; absorbs bursts instead of dropping
+GAME_TOS = 0xB8  # DSCP EF (expedited forwarding): ask for low-latency handling
+BUSY_POLL_USEC = 50  # SO_BUSY_POLL: spin this long on the NIC queue before sleeping in recv
+# Linux option numbers; the socket module only exposes some of them
+SO_INCOMING_CPU = getattr(socket, "SO_INCOMING_CPU", 49)
+SO_BUSY_POLL = getattr(socket, "SO_BUSY_POLL", 46)
 
 # Server parameters
 HALF_SEQ_SPACE = MAX_SEQ_NUM // 2  # Window must be ≤ half sequence space
 DEFAULT_SERVER_ADDR = "localhost"
 DEFAULT_SERVER_PORT = 12001
+PEER_IDLE_TIMEOUT = 0.5  # seconds | silence after which the server stops accepting only the current client
+LATENCY_SAMPLES = 4096  # most recent latencies kept per channel for tail percentiles
+
+# Session summary payload: type, total reliable sent, total unreliable sent
+SUMMARY_STRUCT = struct.Struct('>BQQ')
+SUMMARY_TYPE = 1  # SESSION_END
+
+log = logging.getLogger(__name__)
+# used by verbose=True instances only, so their per-packet trace never changes other instances' output
+_verbose_log = log.getChild("verbose")
+_verbose_log.setLevel(logging.DEBUG)
 
 def handle_sigterm(signum, frame):
     print("\nSIGTERM received...")
@@ -29,45 +68,107 @@ def handle_sigterm(signum, frame):
 signal.signal(signal.SIGTERM, handle_sigterm)
 
 class GameNetAPI:
-    def __init__(self, mode, client_addr=None, client_port=None, server_addr=None, server_port=None, timeout=TIMEOUT, callback_function=None):
+    """Shared UDP socket setup. GameNetAPI(mode=...) constructs a GameNetClient or GameNetServer.
+
+    A server calls callback_function(packet, latency_ms) on its receive thread for every delivered
+    packet. The packet is recycled as soon as the callback returns: copy out any fields (payload
+    is immutable bytes) that must outlive the call instead of keeping the packet itself.
+    """
+
+    def __new__(cls, mode=None, *args, **kwargs):
+        # dispatch on mode once here, so no method needs to check it per call
+        if cls is GameNetAPI:
+            if mode == "server":
+                cls = GameNetServer
+            elif mode == "client":
+                cls = GameNetClient
+            else:
+                raise ValueError("Please specify mode as either 'server' or 'client'.")
+        return super().__new__(cls)
+
+    def __init__(self, mode, timeout=TIMEOUT, verbose=False, cpu=None):
         self.mode = mode
+        # per-packet trace; off by default so the hot paths never format these messages.
+        # Otherwise the level of the "gameNetAPI" logger is left to the application.
+        self.log = _verbose_log if verbose else log
         self.timeout = timeout
         self.retransmission_stop_threshold = RETRANSMISSION_STOP_THRESHOLD
 
-        self.lock = threading.Lock()
-
         # Common UDP socket
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.setblocking(False)
+        # the kernel caps these at net.core.{r,w}mem_max
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        try:
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, GAME_TOS)
+        except OSError:
+            self.log.debug("IP_TOS not supported on this platform")
+        self.cpu = cpu  # if set, the receiving thread and socket softirq processing share this core
+        if cpu is not None:
+            self._pin_socket(cpu)
+
+    def _pin_socket(self, cpu: int):
+        """Ask the kernel to steer this socket's packets to cpu and busy-poll on receive (Linux only)"""
+        for level, option, value, name in ((socket.SOL_SOCKET, SO_INCOMING_CPU, cpu, "SO_INCOMING_CPU"),
+                                           (socket.SOL_SOCKET, SO_BUSY_POLL, BUSY_POLL_USEC, "SO_BUSY_POLL")):
+            try:
+                self.sock.setsockopt(level, option, value)
+            except OSError:
+                self.log.debug("%s not supported on this platform", name)
+
+    def _pin_thread(self):
+        """Pin the calling thread to self.cpu, if one was given (Linux only)"""
+        if self.cpu is not None and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {self.cpu})  # pid 0 = the calling thread on Linux
+
+
+class GameNetClient(GameNetAPI):
+    def __init__(self, mode="client", client_addr=None, client_port=None, server_addr=None, server_port=None, timeout=TIMEOUT, callback_function=None, verbose=False, cpu=None):
+        super().__init__("client", timeout, verbose, cpu)
+        self.client_addr = client_addr
+        self.client_port = client_port
+        self.server_addr = server_addr
+        self.server_port = server_port
+        self.sock.bind((self.client_addr, self.client_port))
+        # single peer: let the kernel cache the destination instead of passing it on every send
+        self.sock.connect((self.server_addr, self.server_port))
+        # shared by the sender, ACK and timer threads; the server does all its work on one thread
+        self.lock = _Lock()
+        self._init_client_state()
 
-        if mode == "server":
-            self.client_addr = None
-            self.client_port = None
-            self.server_addr = server_addr
-            self.server_port = server_port
-            self.sock.bind((self.server_addr, self.server_port))
-            self.callback_function = callback_function
-            self._init_server_state()
-        elif mode == "client":
-            self.client_addr = client_addr
-            self.client_port = client_port
-            self.server_addr = server_addr
-            self.server_port = server_port
-            self.sock.bind((self.client_addr, self.client_port))
-            self._init_client_state()
-        else:
-            raise ValueError("Please specify mode as either 'server' or 'client'.")
-        
     def _init_client_state(self) -> None:
         '''Client-specific state initialization.'''
-        self.seq_num = random.randint(1, MAX_SEQ_NUM)
-        self.max_resend_count = RETRANSMISSION_STOP_THRESHOLD // self.timeout
-
-        self.buffer = []  # stores (payload, channel_type)
-        self.send_window = {}  # seq -> {packet, timer, resend_count}
-        
+        self.seq_num = random.randint(1, MAX_SEQ_NUM) & SEQ_MASK
+
+        # Adaptive retransmission timeout (RFC 6298 estimators). Retries back off linearly by rttvar.
+        self.srtt = None
+        self.rttvar = 0.0
+        self.rto = self.timeout
+
+        self.buffer = queue.SimpleQueue()  # stores (payload, channel_type); single producer, single consumer
+        # send window as parallel per-field ring arrays indexed by seq & WINDOW_MASK. Sequence
+        # numbers are handed out in order, so the slot for the next seq is still taken exactly
+        # while the packet SR_WINDOW_SIZE behind it is un-ACKed: a taken slot means a full window.
+        self.send_window = [None] * SR_WINDOW_SIZE  # packet, or None if the slot is free
+        self.send_wire = [None] * SR_WINDOW_SIZE  # encoded bytes, reused for every retransmission
+        self.resend_counts = [0] * SR_WINDOW_SIZE  # retransmissions so far
+        self.timer_gens = [None] * SR_WINDOW_SIZE  # generation of the live retransmission timer
+        self.send_times = [None] * SR_WINDOW_SIZE  # monotonic time of the first send, for RTT samples and give-up
+        self.pending_retransmits = deque()  # seqs whose timers fired, flushed together
+
+        # self.lock guards the send window tables above; this condition signals a free slot
         self.condition = threading.Condition(self.lock)
 
+        # Retransmission timers: one min-heap of (deadline, seq, gen) served by a single thread.
+        # An entry is stale (cancelled) once its gen no longer matches the gen in seq's slot.
+        # The heap has its own lock so ACK processing never waits on the timer thread.
+        # Lock order: self.lock, then self._timer_lock.
+        self._timers = []
+        self._timer_lock = _Lock()
+        self._timer_cv = threading.Condition(self._timer_lock)
+        self._timer_gen = itertools.count()
+
         # For performance metrics
         self.total_reliable_sent = 0
         self.total_unreliable_sent = 0
@@ -75,196 +176,321 @@ class GameNetAPI:
         # session closing flags
         self.session_summary_ack = threading.Event()
         self.running = True
+        self.sock_closed = False  # set under self.lock by close_client; cheaper than sock.fileno()
 
-        # background threads
-        threading.Thread(target=self.receive_acks, daemon=True).start()
-        threading.Thread(target=self.window_packet, daemon=True).start()
+        self.recv_batch = RecvBatch(RECV_BATCH_SIZE, BUFFER_SIZE)  # pre-allocated ACK receive buffers
 
-    def _init_server_state(self) -> None:
-        '''Server-specific state initialization.'''
-        # Reliable channel state (Selective Repeat)
-        self.reliable_buffer = {}  # {seq_num: (packet, latency)}
-        self.expected_sequence = 0
-        self.first_reliable_packet = True
-        self.window_size = SR_WINDOW_SIZE
-
-        # Timeout tracking for missing packets
-        self.waiting_start_time = None
-        self.waiting_for_seq = None
-
-        self.output_buffer = deque()
-
-        self.receive_thread = None
-        self.shutdown_event = threading.Event()
+        # block in the kernel until an ACK arrives instead of spinning on recvfrom
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.sock, selectors.EVENT_READ)
 
-        # Performance metrics
-        self.total_reliable_sent = 0
-        self.total_unreliable_sent = 0
-        self.total_reliable_success = 0
-        self.metrics = {
-            "reliable": {
-                "packets_received": 0,
-                "duplicates": 0,
-                "out_of_order": 0,
-                "timeouts": 0,
-                "latencies": [],
-                "bytes_received": 0
-            },
-            "unreliable": {
-                "packets_received": 0,
-                "latencies": [],
-                "bytes_received": 0
-            }
-        }
-        self.start_time = None
+        # background threads
+        self.ack_thread = threading.Thread(target=self.receive_acks, daemon=True)
+        self.window_thread = threading.Thread(target=self.window_packet, daemon=True)
+        self.timer_thread = threading.Thread(target=self._timer_loop, daemon=True)
+        self.ack_thread.start()
+        self.window_thread.start()
+        self.timer_thread.start()
 
-    # --- Client Methods ---
     def send_packet(self, payload: any, channel_type: int) -> None:
-        """Add packet to buffer; notify sender thread if waiting."""
-        if self.mode != "client":
-            raise RuntimeError("Method cannot be called in client mode.")
-        
+        """Add packet to buffer; the sender thread wakes when it arrives."""
         if channel_type == 1:
             self.total_reliable_sent += 1
         elif channel_type == 0:
             self.total_unreliable_sent += 1
-        with self.condition:
-            self.buffer.append((payload, channel_type))
-            print(f"[CLIENT] Packet buffered : Channel={channel_type} Payload={payload}")
-            self.condition.notify_all()  # wake up window thread if waiting
+        self.buffer.put((payload, channel_type))
+        self.log.debug("[CLIENT] Packet buffered : Channel=%s Payload=%s", channel_type, payload)
+
+    def send_many(self, packets: list) -> None:
+        """Buffer several (payload, channel_type) pairs at once; the sender thread sends them in sendmmsg batches."""
+        put = self.buffer.put
+        for payload, channel_type in packets:
+            if channel_type == 1:
+                self.total_reliable_sent += 1
+            elif channel_type == 0:
+                self.total_unreliable_sent += 1
+            put((payload, channel_type))
+        self.log.debug("[CLIENT] Packets buffered : Count=%s", len(packets))
 
     # Background thread: move packets from buffer to send window
     def window_packet(self) -> None:
         """ Continuously move packets from buffer to send window when space is available."""
-        if self.mode != "client":
-            raise RuntimeError("Method cannot be called in client mode.")
-        
         while True:
+            item = self.buffer.get()  # block until a packet is buffered
+            if item is None:  # shutdown sentinel from close_client
+                return
+
             with self.condition:
-                # wait until window not full and buffer not empty
-                while len(self.send_window) >= SR_WINDOW_SIZE or len(self.buffer) == 0:
-                    print("[CLIENT] Waiting for window...")
+                # wait until window not full
+                while self.running and self.send_window[self.seq_num & WINDOW_MASK] is not None:
+                    self.log.debug("[CLIENT] Waiting for window...")
                     self.condition.wait()
+                if not self.running:
+                    return
+
+                # take as many buffered packets as the window allows into one batch
+                items = [item]
+                reliable_count = item[1] == 1
+                while (len(items) < SEND_BATCH_SIZE and reliable_count < SR_WINDOW_SIZE
+                       and self.send_window[(self.seq_num + reliable_count) & WINDOW_MASK] is None):
+                    try:
+                        item = self.buffer.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        self.buffer.put(None)  # stop after this batch
+                        break
+                    reliable_count += item[1] == 1
+                    items.append(item)
+
+            # build packets outside the lock, with one clock read per batch
+            stamp = now_ms()
+            batch = [self._build_packet(payload, channel_type, stamp) for payload, channel_type in items]
+            if reliable_count:
+                with self.lock:
+                    for packet in batch:
+                        if packet.channel_type == 1:
+                            self._register_reliable(packet)
 
-                payload, channel_type = self.buffer.pop(0)
-            
             # send outside the lock to avoid blocking other threads
-            self._send_packet_internal(payload, channel_type)
+            self._flush_batch(batch)
+
+    def _build_packet(self, payload: any, channel_type: int, time_stamp: int) -> GameNetPacket:
+        """Build packet based on channel type. Reliable packets get their seq number from _register_reliable."""
+        if channel_type not in (1, 2):  # Unreliable
+            channel_type = 0
+        return GameNetPacket.acquire(
+            channel_type=channel_type,
+            payload=payload,
+            time_stamp=time_stamp
+        )
+
+    def _register_reliable(self, packet: GameNetPacket) -> None:
+        """Assign the next sequence number and add packet to the send window. Caller must hold self.lock."""
+        seq = self.seq_num
+        slot = seq & WINDOW_MASK
+        packet.seq_num = seq
+        self.send_window[slot] = packet
+        self.resend_counts[slot] = 0
+        self.seq_num = (seq + 1) & SEQ_MASK
+
+    def _in_send_window(self, seq: int) -> bool:
+        """Whether seq is still waiting for its ACK. Caller must hold self.lock."""
+        packet = self.send_window[seq & WINDOW_MASK]
+        return packet is not None and packet.seq_num == seq
+
+    def _flush_batch(self, packets: list) -> None:
+        """Send packets in a single batched syscall, then start retransmission timers for reliable ones."""
+        # snapshot fields first: an ACK may recycle a reliable packet as soon as it is on the wire
+        sent = [(packet.channel_type, packet.seq_num, packet.payload) for packet in packets]
+
+        # reliable packets are encoded once to bytes and kept for retransmission;
+        # the rest go through pooled buffers that are recycled straight after the send,
+        # unless they are too large for one
+        buffers = []
+        datagrams = []
+        for packet in packets:
+            if packet.channel_type == 1 or HEADER_SIZE + len(packet.payload) > MAX_PACKET_SIZE:
+                datagrams.append(packet.to_bytes())
+            else:
+                buf = acquire_buffer()
+                buffers.append(buf)
+                datagrams.append(memoryview(buf)[:packet.pack_into(buf)])
+        self._send_buffers(buffers, datagrams)
+
+        # cache the wire bytes and start retransmission timers for the reliable packets
+        now = time.monotonic()
+        with self.lock:
+            for (channel_type, seq, payload), wire in zip(sent, datagrams):
+                if channel_type == 1 and self._in_send_window(seq):
+                    self.send_wire[seq & WINDOW_MASK] = wire
+                    self.send_times[seq & WINDOW_MASK] = now
+                    self._schedule_retransmit(seq)
+
+        for packet, (channel_type, seq, payload) in zip(packets, sent):
+            if channel_type == 1:
+                self.log.debug("[CLIENT] Sent reliable packet: Seq=%s", seq)
+            else:
+                if channel_type == 2:
+                    self.log.debug("[CLIENT] Sent session summary: %s", payload)
+                else:
+                    self.log.debug("[CLIENT] Sent unreliable packet: %s", payload)
+                packet.release()  # not kept for retransmission
+
+    def _send_buffers(self, buffers: list, datagrams: list) -> None:
+        """Send datagrams with one batched syscall and recycle the pooled buffers they view."""
+        try:
+            send_batch(self.sock, datagrams)
+        finally:
+            for datagram in datagrams:
+                if isinstance(datagram, memoryview):
+                    datagram.release()
+            for buf in buffers:
+                release_buffer(buf)
 
     def _send_packet_internal(self, payload: any, channel_type: int) -> None:
-        """Send packet based on channel type."""
-        if self.mode != "client":
-            raise RuntimeError("Method cannot be called in client mode.")
-        
-        if channel_type == 1:  # Reliable
+        """Send a single packet based on channel type."""
+        packet = self._build_packet(payload, channel_type, now_ms())
+        if packet.channel_type == 1:
             with self.lock:
-                seq = self.seq_num
-                packet = GameNetPacket(
-                    channel_type=1,
-                    payload=payload,
-                    seq_num=seq,
-                    time_stamp=int(time.time() * 1000)
-                )
-
-                self.send_window[seq] = {
-                    "packet": packet,
-                    "timer": None,
-                    "resend_count": 0
-                }
-                self.seq_num = (self.seq_num + 1) % MAX_SEQ_NUM
-
-            self.sock.sendto(packet.to_bytes(), (self.server_addr, self.server_port))
-            print(f"[CLIENT] Sent reliable packet: Seq={seq}")
-
-            # start timer for retransmission
-            timer = threading.Timer(self.timeout, self.retransmit_packet, args=(seq,))
+                self._register_reliable(packet)
+        self._flush_batch([packet])
+
+    def _schedule_retransmit(self, seq: int) -> None:
+        """(Re)arm the retransmission timer for seq, invalidating any earlier one. Caller must hold self.lock."""
+        slot = seq & WINDOW_MASK
+        gen = next(self._timer_gen)
+        self.timer_gens[slot] = gen
+        timeout = self.rto + self.resend_counts[slot] * self.rttvar  # linear, not exponential, backoff
+        with self._timer_cv:
+            heapq.heappush(self._timers, (time.monotonic() + timeout, seq, gen))
+            self._timer_cv.notify()  # deadline may now be the earliest
+
+    def _remove_from_window(self, seq: int) -> None:
+        """Drop seq from the send window and recycle its packet. Caller must hold self.lock."""
+        slot = seq & WINDOW_MASK
+        self.send_window[slot].release()
+        self.send_window[slot] = None
+        self.send_wire[slot] = None
+        self.send_times[slot] = None
+        # clearing the gen cancels the timer: the heap entry's gen no longer matches
+        self.timer_gens[slot] = None
+
+    def _update_rtt(self, sample: float) -> None:
+        """Fold an RTT sample into srtt/rttvar and recompute the retransmission timeout. Caller must hold self.lock."""
+        if self.srtt is None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar += (abs(self.srtt - sample) - self.rttvar) / 4
+            self.srtt += (sample - self.srtt) / 8
+        self.rto = max(MIN_RTO, self.srtt + 4 * self.rttvar)
+
+    def _timer_loop(self) -> None:
+        """Single timer thread: wait for the earliest deadline and retransmit everything that is due."""
+        while True:
+            with self._timer_cv:
+                # re-check running under the lock so close_client's notify cannot slip in before the wait
+                while self.running and not self._timers:
+                    self._timer_cv.wait()
+                if not self.running:
+                    return
+
+                delay = self._timers[0][0] - time.monotonic()
+                if delay > 0:
+                    self._timer_cv.wait(timeout=delay)
+                    continue
+
+                # collect every expired timer
+                now = time.monotonic()
+                expired = []
+                while self._timers and self._timers[0][0] <= now:
+                    _, seq, gen = heapq.heappop(self._timers)
+                    expired.append((seq, gen))
+
+            # keep only timers that are still current
             with self.lock:
-                if seq in self.send_window:
-                    self.send_window[seq]["timer"] = timer
-            timer.start()
-        elif channel_type == 2:  # Session Summary
-            packet = GameNetPacket(
-                channel_type=2,
-                payload=payload,
-                time_stamp=int(time.time() * 1000)
-            )
-            self.sock.sendto(packet.to_bytes(), (self.server_addr, self.server_port))
-            print(f"[CLIENT] Sent session summary: {payload}")
-        else:  # Unreliable
-            packet = GameNetPacket(
-                channel_type=0,
-                payload=payload,
-                time_stamp=int(time.time() * 1000)
-            )
-            self.sock.sendto(packet.to_bytes(), (self.server_addr, self.server_port))
-            print(f"[CLIENT] Sent unreliable packet: {payload}")
+                for seq, gen in expired:
+                    if self.timer_gens[seq & WINDOW_MASK] == gen:
+                        self.pending_retransmits.append(seq)
+
+            self._retransmit_pending()
 
     def retransmit_packet(self, seq: int) -> None:
         """Retransmit packet if ACK not received within timeout. Drop if retransmission threshold reached."""
-        if self.mode != "client":
-            raise RuntimeError("Method cannot be called in client mode.")
-        
         with self.lock:
-            entry = self.send_window.get(seq)
-            if not entry or self.sock.fileno() == -1:  # socket closed
-                return
+            self.pending_retransmits.append(seq)
+        self._retransmit_pending()
 
-            if entry["resend_count"] >= self.max_resend_count:
-                print(f"[CLIENT] [DROP] Seq={seq} reached max retransmissions.")
-                del self.send_window[seq]
-                self.condition.notify()  # free window slot
+    def _retransmit_pending(self) -> None:
+        """Retransmit all due packets in one batch; drop those past the retransmission threshold (see below)."""
+        now = time.monotonic()
+        with self.lock:
+            if self.sock_closed:
+                self.pending_retransmits.clear()
                 return
 
-            packet = entry["packet"]
-            print(f"[CLIENT] [RETRANSMIT] Seq={seq}")
-            self.sock.sendto(packet.to_bytes(), (self.server_addr, self.server_port))
-            entry["resend_count"] += 1
-
-            # restart timer
-            timer = threading.Timer(self.timeout, self.retransmit_packet, args=(seq,))
-            entry["timer"] = timer
-            timer.start()
+            batch = []  # wire bytes of packets due for retransmission
+            while self.pending_retransmits:
+                seq = self.pending_retransmits.popleft()
+                if not self._in_send_window(seq):  # already ACKed or dropped
+                    continue
+                slot = seq & WINDOW_MASK
+                wire = self.send_wire[slot]
+                if wire is None:  # first send still in flight
+                    continue
+
+                # Give up on elapsed time, as retries are spaced by the adaptive rto. The receiver starts
+                # its skip timer only when a later seq arrives (>= one-way delay after this send) and
+                # waits the same threshold, so dropping at threshold + rto, after at least one retry,
+                # keeps the window from sliding past a receiver that is still waiting for this seq.
+                if (self.resend_counts[slot]
+                        and now - self.send_times[slot] >= self.retransmission_stop_threshold + self.rto):
+                    self.log.debug("[CLIENT] [DROP] Seq=%s reached the retransmission threshold.", seq)
+                    self._remove_from_window(seq)
+                    self.condition.notify()  # free window slot
+                    continue
+
+                self.log.debug("[CLIENT] [RETRANSMIT] Seq=%s", seq)
+                batch.append(wire)
+                self.resend_counts[slot] += 1
+
+                # restart timer
+                self._schedule_retransmit(seq)
+
+        # send outside the lock so ACK processing and new sends are not held up;
+        # the cached bytes stay valid even if an ACK recycles the packet meanwhile
+        send_batch(self.sock, batch)
 
     def receive_acks(self) -> None:
         """ Continuously receive ACKs from server and process them."""
-        if self.mode != "client":
-            raise RuntimeError("Method cannot be called in client mode.")
-        
+        self._pin_thread()
         while self.running:
-            try:
-                data, addr = self.sock.recvfrom(4096)
-                packet = GameNetPacket.from_bytes(data)
-
-                if packet.channel_type == 1:
-                    ack_num = packet.ack_num
-                    with self.condition:
-                        if ack_num in self.send_window:
-                            print(f"[CLIENT] [ACK RECEIVED] Seq={ack_num}")
-                            self.send_window[ack_num]["timer"].cancel()
-                            del self.send_window[ack_num]
+            if not self.selector.select(timeout=POLL_TIMEOUT):
+                continue
+
+            # drain every datagram that is ready, up to RECV_BATCH_SIZE per recvmmsg call
+            while True:
+                try:
+                    datagrams = self.recv_batch.recv(self.sock, copy=False)
+                except ConnectionRefusedError:
+                    continue  # ICMP port unreachable for an earlier send; server not up yet
+                if not datagrams:
+                    break
+
+                acks = []
+                for data, _ in datagrams:
+                    packet = GameNetPacket.from_bytes(data)
+                    if packet.channel_type == 1:
+                        acks.append(packet.ack_num)
+                    elif packet.channel_type == 2:
+                        self.log.debug("[CLIENT] [SESSION SUMMARY ACK RECEIVED]")
+                        self.session_summary_ack.set()
+                    packet.release()
+
+                if not acks:
+                    continue
+
+                # apply the whole batch of ACKs under one lock acquisition
+                now = time.monotonic()
+                with self.condition:
+                    for ack_num in acks:
+                        if self._in_send_window(ack_num):
+                            self.log.debug("[CLIENT] [ACK RECEIVED] Seq=%s", ack_num)
+                            # Karn's algorithm: only packets never retransmitted give unambiguous samples
+                            slot = ack_num & WINDOW_MASK
+                            if self.resend_counts[slot] == 0 and self.send_times[slot] is not None:
+                                self._update_rtt(now - self.send_times[slot])
+                            self._remove_from_window(ack_num)
                             # Notify sender thread that window has space now
                             self.condition.notify()
-                elif packet.channel_type == 2:
-                    print(f"[CLIENT] [SESSION SUMMARY ACK RECEIVED]")
-                    self.session_summary_ack.set()
-            except BlockingIOError:
-                continue
 
     def close_client(self) -> None:
         """Clean shutdown of client; send session summary to server."""
-        if self.mode != "client":
-            raise RuntimeError("Method cannot be called in client mode.")
-
-        print("[CLIENT] Closing session...")
+        self.log.info("[CLIENT] Closing session...")
 
         # Send session summary (total packets sent)
-        summary = {
-            "type": "SESSION_END",
-            "total_reliable_sent": self.total_reliable_sent,
-            "total_unreliable_sent": self.total_unreliable_sent,
-        }
-
-        payload = json.dumps(summary).encode()
+        payload = SUMMARY_STRUCT.pack(SUMMARY_TYPE, self.total_reliable_sent, self.total_unreliable_sent)
         retries = 3 # number of retries for session summary ack
         ack_received = False
 
@@ -276,348 +502,520 @@ class GameNetAPI:
                 ack_received = True
                 break
 
-            print("[CLIENT] Waiting for session summary ACK...")
+            self.log.info("[CLIENT] Waiting for session summary ACK...")
 
         self.running = False
 
         if not ack_received:
-            print("[CLIENT] [SESSION CLOSE WARNING] Server did not ACK session summary.")
+            self.log.warning("[CLIENT] [SESSION CLOSE WARNING] Server did not ACK session summary.")
 
+        # wake every background thread so it observes running == False, then wait for all of them
+        self.buffer.put(None)
+        with self.condition:
+            self.condition.notify()
+        with self._timer_cv:
+            self._timer_cv.notify()
+
+        self.window_thread.join()
+        self.timer_thread.join()
+        self.ack_thread.join()
+        self.selector.close()
         with self.lock:
-            for seq, entry in list(self.send_window.items()):
-                entry["timer"].cancel()
+            self.sock_closed = True
+            self.sock.close()
+        self.log.info("[CLIENT] Shutdown complete.")
+
+
+class GameNetServer(GameNetAPI):
+    def __init__(self, mode="server", client_addr=None, client_port=None, server_addr=None, server_port=None, timeout=TIMEOUT, callback_function=None, verbose=False, cpu=None, metrics_enabled=True):
+        super().__init__("server", timeout, verbose, cpu)
+        self.client_addr = None
+        self.client_port = None
+        self.peer = None  # client of the current session; the socket is connect()ed to it
+        self.last_peer = None  # client of the previous session
+        self.peer_last_ns = 0  # monotonic time of the last batch from peer
+        self.peer_idle_ns = int(PEER_IDLE_TIMEOUT * 1_000_000_000)
+        self.server_addr = server_addr
+        self.server_port = server_port
+        self.sock.bind((self.server_addr, self.server_port))
+        self.callback_function = callback_function  # packet is only valid during the call; see GameNetAPI
+        self.metrics_enabled = metrics_enabled  # False skips all per-packet bookkeeping
+        self._init_server_state()
 
-        self.sock.close()
-        print("[CLIENT] Shutdown complete.")
+    def _init_server_state(self) -> None:
+        '''Server-specific state initialization.'''
+        # Reliable channel state (Selective Repeat)
+        # Ring of (packet, latency) indexed by seq & WINDOW_MASK; None marks a missing packet.
+        # Only seqs inside the receive window are buffered, so two of them never share a slot.
+        self.reliable_buffer = [None] * SR_WINDOW_SIZE
+        # Bit i set = the packet i ahead of expected_sequence is buffered. Bit 0 is the next
+        # packet to deliver, so sliding the window is a right shift.
+        self.present_mask = 0
+        self.expected_sequence = 0
+        self.first_reliable_packet = True
+        self.window_size = SR_WINDOW_SIZE
+
+        # Timeout tracking for missing packets, in integer monotonic ns
+        self.waiting_start_ns = None
+        self.waiting_for_seq = None
+        self.skip_timeout_ns = int(self.retransmission_stop_threshold * 1_000_000_000)
+
+        # Clocks read once per receive batch and shared by every packet in it
+        self.now_mono_ns = 0  # monotonic, for local timeouts
+        self.now_wall_ns = 0  # wall clock, comparable with the sender's time_stamp (ms)
+
+        self.output_buffer = deque()
+        self.recv_batch = RecvBatch(RECV_BATCH_SIZE, BUFFER_SIZE)  # pre-allocated receive buffers
+        self.pending_acks = {}  # (client_addr, seq) -> None; ordered set of ACKs owed for this batch
+        # Every ACK is the same header except for ack_num, so it is serialized once
+        self.ack_template = GameNetPacket(channel_type=1, seq_num=0, time_stamp=0).to_bytes()
+        self.ack_buffer = bytearray(self.ack_template * RECV_BATCH_SIZE)  # ACKs for one batch side by side
+        self.tx_buffer = bytearray(BUFFER_SIZE)  # reused for one-off sends; sendto copies it before returning
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.sock, selectors.EVENT_READ)
+        # stop() writes to this pair so a blocked select() returns at once
+        self.wake_recv, self.wake_send = socket.socketpair()
+        self.wake_recv.setblocking(False)
+        self.selector.register(self.wake_recv, selectors.EVENT_READ)
+
+        self.receive_thread = None
+        self.shutdown_event = threading.Event()
+
+        # Performance metrics
+        self.total_reliable_sent = 0
+        self.total_unreliable_sent = 0
+        self.total_reliable_success = 0
+        # Per-packet counters, flat attributes so each bump is a single attribute store
+        self.r_pkts = 0
+        self.r_bytes = 0
+        self.r_dups = 0
+        self.r_ooo = 0
+        self.r_timeouts = 0
+        self.u_pkts = 0
+        self.u_bytes = 0
+        # Latency statistics per channel, folded in by _record_latency
+        self.r_latency = self._new_latency_stats()
+        self.u_latency = self._new_latency_stats()
+        self.start_ns = None  # monotonic
+
+    @staticmethod
+    def _new_latency_stats() -> dict:
+        """Empty latency statistics for one channel"""
+        return {
+            "latency_sum": 0.0,
+            "latency_count": 0,
+            "latency_min": math.inf,
+            "latency_max": 0.0,
+            "latencies": deque(maxlen=LATENCY_SAMPLES),
+            "last_latency": None,
+            "jitter": 0.0,
+        }
 
-    # --- Server Methods ---
     def parse_packet(self, data: bytes) -> GameNetPacket:
         """Parse incoming bytes into GameNetPacket."""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
         return GameNetPacket.from_bytes(data)
 
     def create_ack_packet(self, sequence_number: int) -> bytes:
         """Build an ACK packet using the sequence number received."""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
         # ACK the exact packet received
-        ack_packet = GameNetPacket(
-            channel_type=1, seq_num=0, ack_num=sequence_number)
-        # print(f"[SERVER] [ACK CREATED] {ack_packet}")
-        return ack_packet.to_bytes()
+        ack_bytes = bytearray(self.ack_template)
+        ACK_NUM_STRUCT.pack_into(ack_bytes, ACK_NUM_OFFSET, sequence_number)
+        return bytes(ack_bytes)
 
     def _calculate_latency(self, packet: GameNetPacket) -> float:
         """Calculate one-way latency"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
         if packet.time_stamp > 0:
             # time_stamp given in ms
-            return (time.time() * 1000) - packet.time_stamp
+            # integer subtraction first; only the difference is converted to float ms
+            return (self.now_wall_ns - packet.time_stamp * 1_000_000) / 1_000_000
         return 0
 
-    def _process_socket(self):
-        """Internal method to process incoming packets"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-    
-        if self.start_time is None:
-            self.start_time = time.time()
-
-        # Check if we have buffered data to deliver to application
-        if self.output_buffer:
+    def _process_socket(self) -> int:
+        """Internal method to process a batch of incoming packets. Returns number of datagrams received."""
+        # Drain up to RECV_BATCH_SIZE datagrams in one syscall
+        # parsed in place: only each payload is copied out of the batch buffers
+        try:
+            datagrams = self.recv_batch.recv(self.sock, copy=False)
+        except ConnectionRefusedError:
+            datagrams = []  # ICMP port unreachable for an earlier ACK; the client has gone
+
+        self.now_mono_ns = time.monotonic_ns()
+        self.now_wall_ns = time.time_ns()
+        if self.start_ns is None:
+            self.start_ns = self.now_mono_ns
+        for data, self.client_addr in datagrams:
+            if self.peer is None and CAN_DISCONNECT:
+                self._connect_peer()
+            self._process_datagram(data)
+
+        # A client that vanishes without a session summary must not lock out everyone else
+        if self.peer is not None:
+            if datagrams:
+                self.peer_last_ns = self.now_mono_ns
+            elif self.now_mono_ns - self.peer_last_ns >= self.peer_idle_ns:
+                self._disconnect_peer()
+
+        # ACK the whole batch at once
+        self._flush_acks()
+
+        # Check for timeout and skip missing packets, also when the socket is idle
+        if self.waiting_start_ns is not None:
+            self._check_timeout()
+
+        # Deliver everything that became ready to the application in one pass
+        self._deliver_output()
+
+        return len(datagrams)
+
+    def _deliver_output(self):
+        """Hand everything deliverable from this batch to the application callback: unreliable packets
+        and in-order reliable packets, in the order they became deliverable"""
+        while self.output_buffer:
             popped_packet, popped_latency = self.output_buffer.popleft()
             self.callback_function(popped_packet, popped_latency)
-            return
-
-        # Try to receive from socket
-        try:
-            data, self.client_addr = self.sock.recvfrom(BUFFER_SIZE)
-        except BlockingIOError:
-            return None
+            popped_packet.release()  # callback has returned; recycle packet
 
+    def _process_datagram(self, data: bytes):
+        """Run a single received datagram through the channel / Selective Repeat logic"""
         packet = self.parse_packet(data)
         latency = self._calculate_latency(packet)
 
         # Unreliable channel
         if packet.channel_type == 0:
-            self.metrics["unreliable"]["packets_received"] += 1
-            self.metrics["unreliable"]["bytes_received"] += len(packet.payload)
-            if latency > 0:
-                self.metrics["unreliable"]["latencies"].append(latency)
-
-            print(
-                f"[SERVER] [UNRELIABLE] SeqNo={packet.seq_num}, Latency={latency:.2f}ms, Payload={packet.payload[:50]}")
-            self.callback_function(packet, latency)
+            if self.metrics_enabled:
+                self.u_pkts += 1
+                self.u_bytes += len(packet.payload)
+                if latency > 0:
+                    self._record_latency(self.u_latency, latency)
+
+            self.log.debug("[SERVER] [UNRELIABLE] SeqNo=%s, Latency=%.2fms, Payload=%s",
+                      packet.seq_num, latency, packet.payload[:50])
+            # queued with the reliable deliveries so the batch reaches the application in arrival order
+            self.output_buffer.append((packet, latency))
             return
-        
+
         if packet.channel_type == 2:
-            print(f"[SERVER] [SESSION SUMMARY RECEIVED]")
+            self.log.debug("[SERVER] [SESSION SUMMARY RECEIVED]")
             self._process_session_summary(packet.payload)
             self._send_session_ack()
+            packet.release()
             return None
 
-        # Reliable channel
-        self.metrics["reliable"]["packets_received"] += 1
-        self.metrics["reliable"]["bytes_received"] += len(packet.payload)
-        if latency > 0:
-            self.metrics["reliable"]["latencies"].append(latency)
+        # Reliable channel; hot fields bound to locals once per packet
+        seq = packet.seq_num
+        metrics_enabled = self.metrics_enabled
+        if metrics_enabled:
+            self.r_pkts += 1
+            self.r_bytes += len(packet.payload)
+            if latency > 0:
+                self._record_latency(self.r_latency, latency)
 
         # Initialize expected sequence from first reliable packet
         if self.first_reliable_packet:
-            self.expected_sequence = packet.seq_num
+            self.expected_sequence = seq
             self.first_reliable_packet = False
-            print(
-                f"[SERVER] Initialized expected_sequence={self.expected_sequence}")
+            self.log.debug("[SERVER] Initialized expected_sequence=%s", seq)
             # self._start_waiting(self.expected_sequence)
-            
+
+        expected = self.expected_sequence
+        # How far the packet is ahead of the window start; 1 to HALF_SEQ_SPACE-1 behind wraps
+        # to more than HALF_SEQ_SPACE ahead. Computed once for both window checks below.
+        distance = (seq - expected) & SEQ_MASK
 
         # Case 1: Duplicate packet (already delivered, behind window)
-        if self._has_been_delivered(packet.seq_num):
-            self.metrics["reliable"]["duplicates"] += 1
-            print(
-                f"[SERVER] Duplicate SeqNo={packet.seq_num} (Expected={self.expected_sequence}) - Resending ACK")
-            self._send_ack(packet.seq_num)
+        if distance > HALF_SEQ_SPACE:
+            if metrics_enabled:
+                self.r_dups += 1
+            self.log.debug("[SERVER] Duplicate SeqNo=%s (Expected=%s) - Resending ACK", seq, expected)
+            self.pending_acks[(self.client_addr, seq)] = None  # sent by _flush_acks
+            packet.release()
+
+        # Fast path: the expected packet with nothing buffered behind it (the usual case without
+        # loss or reordering) is delivered straight away, skipping the buffer and drain loop.
+        # Nothing is buffered, so no skip timeout is pending either.
+        elif not distance and not self.present_mask:
+            self.total_reliable_success += 1
+            self.pending_acks[(self.client_addr, seq)] = None
+            self.output_buffer.append((packet, latency))
+            self.expected_sequence = (seq + 1) & SEQ_MASK
+            self.log.debug("[SERVER] Delivered SeqNo=%s, Latency=%.2fms", seq, latency)
 
         # Case 2: Packet within receive window [expected_seq, expected_seq + window_size - 1]
-        elif self._is_within_receive_window(packet.seq_num):
-            if packet.seq_num not in self.reliable_buffer:  # New packet - buffer it
-                self.reliable_buffer[packet.seq_num] = (packet, latency)
-                if packet.seq_num != self.expected_sequence:
-                    self.metrics["reliable"]["out_of_order"] += 1
-                    self._start_waiting(self.expected_sequence)  # Received higher seq, start waiting for expected
+        elif distance < self.window_size:
+            bit = 1 << distance
+            present_mask = self.present_mask
+            is_new = not present_mask & bit
+            if is_new:  # New packet - buffer it
+                self.reliable_buffer[seq & WINDOW_MASK] = (packet, latency)
+                self.present_mask = present_mask | bit
+                if distance:
+                    if metrics_enabled:
+                        self.r_ooo += 1
+                    self._start_waiting(expected)  # Received higher seq, start waiting for expected
 
                 self.total_reliable_success += 1
-                print(
-                    f"[SERVER] Buffered SeqNo={packet.seq_num}, Latency={latency:.2f}ms, "
-                    f"Expected={self.expected_sequence}, Buffer_size={len(self.reliable_buffer)}"
-                )
+                self.log.debug("[SERVER] Buffered SeqNo=%s, Latency=%.2fms, Expected=%s, Buffer_size=%s",
+                          seq, latency, expected, self.present_mask.bit_count())
             else:  # Duplicate packet within window
-                self.metrics["reliable"]["duplicates"] += 1
-                print(f"[SERVER] Duplicate buffered SeqNo={packet.seq_num}")
+                if metrics_enabled:
+                    self.r_dups += 1
+                self.log.debug("[SERVER] Duplicate buffered SeqNo=%s", seq)
 
-            # Send ACK
-            self._send_ack(packet.seq_num)
+            # Queue ACK; duplicates within a batch collapse
+            self.pending_acks[(self.client_addr, seq)] = None
+            if not is_new:
+                packet.release()  # earlier copy is already buffered
 
-            # Deliver consecutive packets
-            self._drain_in_order()
+            # Deliver consecutive packets; only an in-order arrival can make bit 0 present
+            if not distance:
+                self._drain_in_order()
 
         # Case 3: Packet outside receive window (too ahead or too behind)
         else:
-            print(
-                f"[SERVER] Out-of-window SeqNo={packet.seq_num}, "
-                f"Window=[{self.expected_sequence}, {(self.expected_sequence + self.window_size - 1) % MAX_SEQ_NUM}]"
-            )
+            self.log.debug("[SERVER] Out-of-window SeqNo=%s, Window=[%s, %s]", seq,
+                      expected, (expected + self.window_size - 1) & SEQ_MASK)
             # No ACKs for out of window
-
-        # Return data if available after processing
-        if self.output_buffer:
-            popped_packet, popped_latency = self.output_buffer.popleft()
-            self.callback_function(popped_packet, popped_latency)
-            return
-            
-        # Check for timeout and skip missing packets
-        self._check_timeout()
-
-        return None
+            packet.release()
 
     def _receive_loop(self):
         """Continuously processes packets"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-
-        print("[SERVER] [THREAD] Receive thread started")
+        self.log.debug("[SERVER] [THREAD] Receive thread started")
+        self._pin_thread()
 
         while not self.shutdown_event.is_set():
-            self._process_socket()
-            time.sleep(0.001)  # Sleep to avoid busy-waiting
+            # A full batch may leave more queued, so read again straight away. A short one means
+            # recvmmsg hit EAGAIN: the socket is drained, so block without another empty read
+            # until the next datagram arrives or a skip timeout is due.
+            if self._process_socket() < RECV_BATCH_SIZE:
+                self.selector.select(timeout=self._select_timeout())
 
-        print("[SERVER] [THREAD] Receive thread stopped")
+        self.log.debug("[SERVER] [THREAD] Receive thread stopped")
 
     def start(self):
         """Start the receive thread"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
         if self.receive_thread is None or not self.receive_thread.is_alive():
             self.shutdown_event.clear()
             self.receive_thread = threading.Thread(
                 target=self._receive_loop, daemon=True)
             self.receive_thread.start()
-            print("[SERVER] Started listening for packets")
+            self.log.info("[SERVER] Started listening for packets")
 
     def stop(self):
         """Stop the receive thread gracefully"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
         if self.receive_thread and self.receive_thread.is_alive():
-            print("[SERVER] Stopping receive thread due to stop method given...")
+            self.log.info("[SERVER] Stopping receive thread due to stop method given...")
             self.shutdown_event.set()
+            self.wake_send.send(b"\0")
             self.receive_thread.join()
+            self._disconnect_peer()
+            # discard the wake-up byte so a later start() does not wake immediately
+            try:
+                self.wake_recv.recv(16)
+            except BlockingIOError:
+                pass
+
+    def _select_timeout(self) -> float | None:
+        """How long the receive loop may block: until the pending skip timeout or peer idle timeout, or indefinitely"""
+        deadlines = []
+        if self.waiting_start_ns is not None:
+            deadlines.append(self.waiting_start_ns + self.skip_timeout_ns)
+        if self.peer is not None:
+            deadlines.append(self.peer_last_ns + self.peer_idle_ns)
+        if not deadlines:
+            return None  # only a datagram or stop() can make progress
+        remaining = (min(deadlines) - time.monotonic_ns()) / 1_000_000_000
+        return max(0, remaining)
 
     def _start_waiting(self, seq_num: int):
         """Start timeout timer for expected sequence number"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
         if self.waiting_for_seq != seq_num:
             self.waiting_for_seq = seq_num
-            self.waiting_start_time = time.time()
-            print(f"[SERVER] Started waiting for SeqNo={seq_num}")
+            self.waiting_start_ns = self.now_mono_ns
+            self.log.debug("[SERVER] Started waiting for SeqNo=%s", seq_num)
 
     def _check_timeout(self):
         """Check if expected packet has timed out and skip if necessary"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
-        if self.waiting_start_time is None:
+        if self.waiting_start_ns is None:
             return
 
-        elapsed = time.time() - self.waiting_start_time
+        elapsed_ns = self.now_mono_ns - self.waiting_start_ns
 
-        if (self.waiting_for_seq == self.expected_sequence and elapsed >= self.retransmission_stop_threshold):
-            self.metrics["reliable"]["timeouts"] += 1
-            print(
-                f"[SERVER] [TIMEOUT] SeqNo={self.expected_sequence} timed out after {elapsed:.3f}s "
-                f"(threshold={self.retransmission_stop_threshold}s). Skipping packet..."
-            )
+        if (self.waiting_for_seq == self.expected_sequence and elapsed_ns >= self.skip_timeout_ns):
+            if self.metrics_enabled:
+                self.r_timeouts += 1
+            self.log.debug("[SERVER] [TIMEOUT] SeqNo=%s timed out after %.3fs (threshold=%ss). Skipping packet...",
+                      self.expected_sequence, elapsed_ns / 1_000_000_000, self.retransmission_stop_threshold)
 
-            if len(self.reliable_buffer) == 0:  # Empty buffer, return
+            if not self.present_mask:  # Empty buffer, nothing to skip to
+                self._update_waiting()
                 return
 
-            # Try to deliver buffered least consecutive packets
-            min_seq = min(self.reliable_buffer.keys())
-            while min_seq in self.reliable_buffer:
-                packet, latency = self.reliable_buffer.pop(min_seq)
-                print(
-                    f"[SERVER] Delivering SeqNo={min_seq} to receiver application")
-                self.output_buffer.append((packet, latency))
-                min_seq = (min_seq + 1) % MAX_SEQ_NUM
-                self.expected_sequence = min_seq
-
-            # Update timeout tracking
-            self.waiting_start_time = None # Reset timeout until next higher seq packet arrives
+            # Skip past the missing packets to the least buffered seq: the lowest set bit
+            skip = (self.present_mask & -self.present_mask).bit_length() - 1
+            self.present_mask >>= skip
+            self.expected_sequence = (self.expected_sequence + skip) & SEQ_MASK
+
+            # Deliver consecutive packets from there; also updates timeout tracking
+            self._drain_in_order()
+
+    def _update_waiting(self):
+        """After the window slides, wait for the new expected seq if later packets are still buffered"""
+        if self.present_mask:
+            self._start_waiting(self.expected_sequence)
+        else:
+            self.waiting_start_ns = None # Reset timeout until next higher seq packet arrives
             self.waiting_for_seq = None
 
     # For reliable packets
-    def _send_ack(self, seq_num: int):
-        """Send ACK for specific sequence number"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
-        if self.client_addr is not None:
-            print(f"[SERVER] [ACK SENT] SeqNo={seq_num}")
-            ack_pkt = self.create_ack_packet(seq_num)
-            self.sock.sendto(ack_pkt, self.client_addr)
+    def _flush_acks(self):
+        """Send all queued ACKs, one batched syscall per client address"""
+        if not self.pending_acks:
+            return
+
+        if len(self.ack_buffer) < len(self.pending_acks) * HEADER_SIZE:
+            self.ack_buffer = bytearray(self.ack_template * len(self.pending_acks))
+
+        # the buffer already holds template headers: patch each ack_num in place and send slices of it
+        buf = memoryview(self.ack_buffer)
+        acks_by_addr = {}
+        offset = 0
+        for addr, seq_num in self.pending_acks:
+            self.log.debug("[SERVER] [ACK SENT] SeqNo=%s", seq_num)
+            ACK_NUM_STRUCT.pack_into(self.ack_buffer, offset + ACK_NUM_OFFSET, seq_num)
+            end = offset + HEADER_SIZE
+            acks_by_addr.setdefault(addr, []).append(buf[offset:end])
+            offset = end
+        self.pending_acks.clear()
+
+        try:
+            for addr, acks in acks_by_addr.items():
+                send_batch(self.sock, acks, None if addr == self.peer else addr)
+        finally:
+            for acks in acks_by_addr.values():
+                for view in acks:
+                    view.release()
+            buf.release()
 
     def _send_session_ack(self):
-        """Send ACK for session summary"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
+        """Send ACK for session summary; the session is over, so the socket is disconnected from its client"""
         if self.client_addr is not None:
-            ack_packet = GameNetPacket(channel_type=2, seq_num=0, ack_num=0)
-            print(f"[SERVER] [SESSION SUMMARY ACK SENT]")
-            self.sock.sendto(ack_packet.to_bytes(), self.client_addr)
+            ack_packet = GameNetPacket.acquire(channel_type=2, seq_num=0, ack_num=0)
+            n = ack_packet.pack_into(self.tx_buffer)
+            ack_packet.release()
+            self.log.debug("[SERVER] [SESSION SUMMARY ACK SENT]")
+            with memoryview(self.tx_buffer) as buf, buf[:n] as ack:
+                # send_batch retries a stale ICMP error, which a connected socket reports here
+                send_batch(self.sock, [ack], None if self.client_addr == self.peer else self.client_addr)
+            self._disconnect_peer()
+
+    def _connect_peer(self):
+        """connect() the socket to client_addr for the session: the kernel then skips an address
+        lookup on every send and filters out datagrams from anyone else"""
+        if self.last_peer is not None and self.client_addr != self.last_peer:
+            self._reset_receive_window()  # a new client starts its own sequence space
+        self.sock.connect(self.client_addr)
+        self.peer = self.last_peer = self.client_addr
+        self.log.debug("[SERVER] Connected to client %s", self.peer)
+
+    def _reset_receive_window(self):
+        """Forget the previous client's reliable stream; its undelivered packets are discarded"""
+        for entry in self.reliable_buffer:
+            if entry is not None:
+                entry[0].release()
+        self.reliable_buffer = [None] * SR_WINDOW_SIZE
+        self.present_mask = 0
+        self.first_reliable_packet = True
+        self._update_waiting()
+
+    def _disconnect_peer(self):
+        """Undo _connect_peer so the next session can come from any address"""
+        if self.peer is not None:
+            disconnect(self.sock)
+            self.log.debug("[SERVER] Disconnected from client %s", self.peer)
+            self.peer = None
 
     def _drain_in_order(self):
         """Deliver buffered packets in order and slide receive window"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
-        if len(self.reliable_buffer) == 0: # Empty buffer, return
+        if not self.present_mask: # Empty buffer, return
             return
 
         # Else deliver consecutive packets
-        while self.expected_sequence in self.reliable_buffer:
-            packet, latency = self.reliable_buffer.pop(self.expected_sequence)
-            self.output_buffer.append((packet, latency))
-            print(f"[SERVER] Delivered SeqNo={self.expected_sequence}")
-            self.expected_sequence = (self.expected_sequence + 1) % MAX_SEQ_NUM
-
-    def _is_within_receive_window(self, seq_num: int) -> bool:
-        """Check if seq_num is within receive window [expected_seq, expected_seq + window_size - 1]"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
-        distance_from_window_start = (
-            seq_num - self.expected_sequence) % MAX_SEQ_NUM
-        return distance_from_window_start < self.window_size
-
-    def _has_been_delivered(self, seq_num: int) -> bool:
-        """Check if packet has already been delivered (behind window)"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
-        if seq_num == self.expected_sequence:
-            return False
-
-        distance_behind = (self.expected_sequence - seq_num) % MAX_SEQ_NUM
-        # Packets 1 to HALF_SEQ_SPACE-1 behind are old (already delivered)
-        return 0 < distance_behind < HALF_SEQ_SPACE
-    
+        while self.present_mask & 1:
+            slot = self.expected_sequence & WINDOW_MASK
+            self.output_buffer.append(self.reliable_buffer[slot])
+            self.reliable_buffer[slot] = None
+            self.present_mask >>= 1
+            self.log.debug("[SERVER] Delivered SeqNo=%s", self.expected_sequence)
+            self.expected_sequence = (self.expected_sequence + 1) & SEQ_MASK
+        self._update_waiting()
+
     def _process_session_summary(self, payload: bytes):
         """Process session summary received from client"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
         try:
-            summary = json.loads(payload.decode())
-            self.total_reliable_sent = summary.get("total_reliable_sent", 0)
-            self.total_unreliable_sent = summary.get("total_unreliable_sent", 0)
-            print(f"[SERVER] [SESSION SUMMARY] Reliable Sent={self.total_reliable_sent}, Unreliable Sent={self.total_unreliable_sent}")
-
-        except Exception as e:
-            print(f"[SERVER] [ERROR] Failed to process session summary: {e}")
-
-    def _calculate_jitter(self, latencies):
-        """Calculate jitter following RFC 3550 standard"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
-        if len(latencies) < 2:
-            return 0
-
-        jitter = 0
-
-        for i in range(1, len(latencies)):
+            _, self.total_reliable_sent, self.total_unreliable_sent = SUMMARY_STRUCT.unpack(payload)
+            self.log.info("[SERVER] [SESSION SUMMARY] Reliable Sent=%s, Unreliable Sent=%s",
+                     self.total_reliable_sent, self.total_unreliable_sent)
+
+        except struct.error as e:
+            self.log.error("[SERVER] [ERROR] Failed to process session summary: %s", e)
+
+    def _record_latency(self, channel_metrics: dict, latency: float):
+        """Fold one latency sample into the running average and RFC 3550 jitter"""
+        channel_metrics["latency_sum"] += latency
+        channel_metrics["latency_count"] += 1
+        if latency < channel_metrics["latency_min"]:
+            channel_metrics["latency_min"] = latency
+        if latency > channel_metrics["latency_max"]:
+            channel_metrics["latency_max"] = latency
+        channel_metrics["latencies"].append(latency)  # bounded; oldest sample falls off
+
+        last_latency = channel_metrics["last_latency"]
+        if last_latency is not None:
             # Difference between consecutive latencies
-            transit_diff = abs(latencies[i] - latencies[i-1])
+            transit_diff = abs(latency - last_latency)
 
             # s->jitter += (1./16.) * ((double)d - s->jitter)
-            jitter = jitter + (transit_diff - jitter) / 16
+            channel_metrics["jitter"] += (transit_diff - channel_metrics["jitter"]) / 16
+        channel_metrics["last_latency"] = latency
 
-        return jitter
+    def _latency_percentile(self, channel_metrics: dict, pct: float) -> float:
+        """Latency at the given percentile over the recent sample window"""
+        samples = sorted(channel_metrics["latencies"])
+        if not samples:
+            return 0
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+    def _latency_report(self, stats: dict) -> dict:
+        """Latency fields of the metrics report for one channel"""
+        count = stats["latency_count"]
+        return {
+            "avg_latency_ms": stats["latency_sum"] / count if count else 0,
+            "min_latency_ms": stats["latency_min"] if count else 0,
+            "max_latency_ms": stats["latency_max"],
+            "p99_latency_ms": self._latency_percentile(stats, 99),
+            "jitter_ms": stats["jitter"],
+        }
 
     def get_metrics(self):
         """Calculate and return performance metrics"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
-        duration = time.time() - self.start_time if self.start_time else 1
+        duration = (time.monotonic_ns() - self.start_ns) / 1_000_000_000 if self.start_ns else 1
 
         metrics_report = {
             "duration": duration,
             "reliable": {
-                "packets_received": self.metrics["reliable"]["packets_received"],
-                "duplicates": self.metrics["reliable"]["duplicates"],
-                "out_of_order": self.metrics["reliable"]["out_of_order"],
-                "timeouts": self.metrics["reliable"]["timeouts"],
-                "avg_latency_ms": sum(self.metrics["reliable"]["latencies"]) / len(self.metrics["reliable"]["latencies"]) if self.metrics["reliable"]["latencies"] else 0,
-                "throughput_bytes": (self.metrics["reliable"]["bytes_received"]) / duration,
+                "packets_received": self.r_pkts,
+                "duplicates": self.r_dups,
+                "out_of_order": self.r_ooo,
+                "timeouts": self.r_timeouts,
+                **self._latency_report(self.r_latency),
+                "throughput_bytes": self.r_bytes / duration,
                 "delivery_ratio_pct": self.total_reliable_success / self.total_reliable_sent * 100 if self.total_reliable_sent > 0 else 0,
-                "jitter_ms": self._calculate_jitter(self.metrics["reliable"]["latencies"])
             },
             "unreliable": {
-                "packets_received": self.metrics["unreliable"]["packets_received"],
-                "avg_latency_ms": sum(self.metrics["unreliable"]["latencies"]) / len(self.metrics["unreliable"]["latencies"]) if self.metrics["unreliable"]["latencies"] else 0,
-                "throughput_bytes": (self.metrics["unreliable"]["bytes_received"]) / duration,
-                "delivery_ratio_pct": self.metrics["unreliable"]["packets_received"] / self.total_unreliable_sent * 100 if self.total_unreliable_sent > 0 else 0,
-                "jitter_ms": self._calculate_jitter(self.metrics["unreliable"]["latencies"])
+                "packets_received": self.u_pkts,
+                **self._latency_report(self.u_latency),
+                "throughput_bytes": self.u_bytes / duration,
+                "delivery_ratio_pct": self.u_pkts / self.total_unreliable_sent * 100 if self.total_unreliable_sent > 0 else 0,
             }
         }
 
@@ -625,36 +1023,33 @@ class GameNetAPI:
 
     def print_metrics(self):
         """Print metrics"""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
         metrics = self.get_metrics()
 
-        print(f"Test Duration: {metrics["duration"]:.2f}s\n")
+        print(f"Test Duration: {metrics['duration']:.2f}s\n")
 
         print("RELIABLE CHANNEL:")
-        # print(f"Packets Received: {metrics["reliable"]["packets_received"]}")
-        # print(f"Duplicates: {metrics["reliable"]["duplicates"]}")
-        # print(f"Out-of-Order: {metrics["reliable"]["out_of_order"]}")
-        # print(f"Timeouts: {metrics["reliable"]["timeouts"]}")
-        print(f"Avg Latency: {metrics["reliable"]["avg_latency_ms"]:.2f} ms")
-        print(f"Throughput: {metrics["reliable"]["throughput_bytes"]:.2f} bytes per second")
-        print(f"Delivery Ratio: {metrics["reliable"]["delivery_ratio_pct"]:.2f}%")
-        print(f"Jitter: {metrics["reliable"]["jitter_ms"]:.2f} ms\n")
+        # print(f"Packets Received: {metrics['reliable']['packets_received']}")
+        # print(f"Duplicates: {metrics['reliable']['duplicates']}")
+        # print(f"Out-of-Order: {metrics['reliable']['out_of_order']}")
+        # print(f"Timeouts: {metrics['reliable']['timeouts']}")
+        print(f"Avg Latency: {metrics['reliable']['avg_latency_ms']:.2f} ms")
+        print(f"Throughput: {metrics['reliable']['throughput_bytes']:.2f} bytes per second")
+        print(f"Delivery Ratio: {metrics['reliable']['delivery_ratio_pct']:.2f}%")
+        print(f"Jitter: {metrics['reliable']['jitter_ms']:.2f} ms\n")
 
         print("UNRELIABLE CHANNEL:")
-        # print(f"Packets Received: {metrics["unreliable"]["packets_received"]}")
-        print(f"Avg Latency: {metrics["unreliable"]["avg_latency_ms"]:.2f} ms")
-        print(f"Throughput: {metrics["unreliable"]["throughput_bytes"]:.2f} bytes per second")
-        print(f"Delivery Ratio: {metrics["unreliable"]["delivery_ratio_pct"]:.2f}%")
-        print(f"Jitter: {metrics["unreliable"]["jitter_ms"]:.2f} ms")
+        # print(f"Packets Received: {metrics['unreliable']['packets_received']}")
+        print(f"Avg Latency: {metrics['unreliable']['avg_latency_ms']:.2f} ms")
+        print(f"Throughput: {metrics['unreliable']['throughput_bytes']:.2f} bytes per second")
+        print(f"Delivery Ratio: {metrics['unreliable']['delivery_ratio_pct']:.2f}%")
+        print(f"Jitter: {metrics['unreliable']['jitter_ms']:.2f} ms")
 
     def close_server(self):
         """Clean shutdown of server."""
-        if self.mode != "server":
-            raise RuntimeError("Method can only be called in server mode.")
-        
         self.stop()
+        self.selector.close()
+        self.wake_recv.close()
+        self.wake_send.close()
         self.sock.close()
         self.print_metrics()
-        print("[SERVER] Shutdown complete.")
+        self.log.info("[SERVER] Shutdown complete.")
@@ -0,0 +1,218 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import socket
+import sys
+
+# Batched datagram I/O: one sendmmsg(2)/recvmmsg(2) call moves a whole batch of datagrams
+# across the kernel boundary. Falls back to sendto/recvfrom loops where unavailable.
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [
+        ("iov_base", ctypes.c_void_p),
+        ("iov_len", ctypes.c_size_t),
+    ]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_hdr", _MsgHdr),
+        ("msg_len", ctypes.c_uint),
+    ]
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),  # network byte order
+        ("sin_addr", ctypes.c_uint8 * 4),
+        ("sin_zero", ctypes.c_uint8 * 8),
+    ]
+
+
+def _bind(name: str, argtypes: list):
+    '''Bind a libc function on Linux; None elsewhere or if libc lacks it.'''
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        func = getattr(libc, name)
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = argtypes
+    func.restype = ctypes.c_int
+    return func
+
+
+_sendmmsg = _bind("sendmmsg", [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int])
+_recvmmsg = _bind("recvmmsg", [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p])
+_connect = _bind("connect", [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint32])
+
+# Python's connect() cannot pass AF_UNSPEC, so undoing a UDP connect() needs libc
+CAN_DISCONNECT = _connect is not None
+
+
+def _sockaddr_in(addr: tuple) -> _SockAddrIn:
+    """Build a struct sockaddr_in for an (host, port) tuple."""
+    host, port = addr
+    sockaddr = _SockAddrIn()
+    sockaddr.sin_family = socket.AF_INET
+    sockaddr.sin_port = socket.htons(port)
+    sockaddr.sin_addr[:] = socket.inet_aton(socket.gethostbyname(host))
+    return sockaddr
+
+
+def _buffer_address(data) -> tuple[int, object]:
+    """Return (address, keepalive) for a bytes/bytearray without copying."""
+    if isinstance(data, bytes):
+        ref = ctypes.c_char_p(data)
+        return ctypes.cast(ref, ctypes.c_void_p).value, ref
+    ref = (ctypes.c_char * len(data)).from_buffer(data)
+    return ctypes.addressof(ref), ref
+
+
+def send_batch(sock: socket.socket, datagrams: list, addr: tuple = None) -> None:
+    """Send every datagram to addr (or the connected peer) with as few syscalls as possible."""
+    if not datagrams:
+        return
+
+    if _sendmmsg is None or sock.family != socket.AF_INET:
+        for data in datagrams:
+            try:
+                _send_one(sock, data, addr)
+            except ConnectionRefusedError:
+                # stale ICMP error from an earlier datagram; reading it cleared it
+                _send_one(sock, data, addr)
+        return
+
+    count = len(datagrams)
+    iovecs = (_IOVec * count)()
+    msgs = (_MMsgHdr * count)()
+    # ctypes views of the datagrams: while they live, the caller's buffers stay exported and
+    # cannot be released or resized, so they are dropped before returning
+    keepalive = []
+
+    name = None
+    if addr is not None:
+        name = _sockaddr_in(addr)
+
+    for i, data in enumerate(datagrams):
+        address, ref = _buffer_address(data)
+        keepalive.append(ref)
+        del ref
+        iovecs[i].iov_base = address
+        iovecs[i].iov_len = len(data)
+        hdr = msgs[i].msg_hdr
+        hdr.msg_iov = ctypes.pointer(iovecs[i])
+        hdr.msg_iovlen = 1
+        if name is not None:
+            hdr.msg_name = ctypes.addressof(name)
+            hdr.msg_namelen = ctypes.sizeof(name)
+
+    try:
+        # sendmmsg may send fewer than requested; resume from the first unsent message
+        sent = 0
+        refused = False
+        while sent < count:
+            ret = _sendmmsg(sock.fileno(), ctypes.byref(msgs[sent]), count - sent, 0)
+            if ret < 0:
+                err = ctypes.get_errno()
+                if err == errno.ECONNREFUSED and not refused:
+                    # stale ICMP error from an earlier datagram on a connected socket; reading it cleared it
+                    refused = True
+                    continue
+                raise OSError(err, os.strerror(err))
+            sent += ret
+    finally:
+        keepalive.clear()
+
+
+def disconnect(sock: socket.socket) -> None:
+    """Dissolve a datagram socket's peer association (connect(2) with AF_UNSPEC). Requires CAN_DISCONNECT."""
+    sockaddr = _SockAddrIn()  # zeroed: sin_family 0 is AF_UNSPEC
+    if _connect(sock.fileno(), ctypes.addressof(sockaddr), ctypes.sizeof(sockaddr)) < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+
+
+def _send_one(sock: socket.socket, data, addr: tuple = None) -> None:
+    if addr is None:
+        sock.send(data)
+    else:
+        sock.sendto(data, addr)
+
+
+class RecvBatch:
+    """Pre-allocated buffers for draining up to `size` datagrams per recvmmsg(2) call."""
+
+    def __init__(self, size: int, buffer_size: int):
+        self.size = size
+        self.buffer_size = buffer_size
+
+        # allocated once and reused for every call
+        self.buffers = [(ctypes.c_char * buffer_size)() for _ in range(size)]
+        self.views = [memoryview(buf).cast("B") for buf in self.buffers]
+        self.names = (_SockAddrIn * size)()
+        self.iovecs = (_IOVec * size)()
+        self.msgs = (_MMsgHdr * size)()
+        for i in range(size):
+            self.iovecs[i].iov_base = ctypes.addressof(self.buffers[i])
+            self.iovecs[i].iov_len = buffer_size
+            hdr = self.msgs[i].msg_hdr
+            hdr.msg_iov = ctypes.pointer(self.iovecs[i])
+            hdr.msg_iovlen = 1
+            hdr.msg_name = ctypes.addressof(self.names[i])
+
+    def recv(self, sock: socket.socket, copy: bool = True) -> list[tuple[bytes, tuple]]:
+        """Return every (data, addr) currently queued on the socket, up to `size`, without blocking.
+
+        With copy=False, data are memoryviews into the batch buffers, valid only until the next call.
+        """
+        if _recvmmsg is None or sock.family != socket.AF_INET:
+            return self._recv_fallback(sock)
+
+        for i in range(self.size):
+            # kernel overwrites the address length on every call
+            self.msgs[i].msg_hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)
+
+        ret = _recvmmsg(sock.fileno(), self.msgs, self.size, socket.MSG_DONTWAIT, None)
+        if ret < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return []
+            raise OSError(err, os.strerror(err))
+
+        datagrams = []
+        for i in range(ret):
+            name = self.names[i]
+            addr = (socket.inet_ntoa(bytes(name.sin_addr)), socket.ntohs(name.sin_port))
+            if copy:
+                data = ctypes.string_at(self.buffers[i], self.msgs[i].msg_len)
+            else:
+                data = self.views[i][:self.msgs[i].msg_len]
+            datagrams.append((data, addr))
+        return datagrams
+
+    def _recv_fallback(self, sock: socket.socket) -> list[tuple[bytes, tuple]]:
+        """recvfrom loop used where recvmmsg is unavailable."""
+        datagrams = []
+        while len(datagrams) < self.size:
+            try:
+                datagrams.append(sock.recvfrom(self.buffer_size))
+            except BlockingIOError:
+                break
+        return datagrams
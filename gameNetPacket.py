@@ -1,4 +1,7 @@
+import functools
+import struct
 import time
+from collections import deque
 from datetime import datetime
 
 CHANNEL_TYPE_SIZE = 1
@@ -7,33 +10,93 @@ ACK_NUM_SIZE = 2
 TIME_STAMP_SIZE = 8
 HEADER_SIZE = CHANNEL_TYPE_SIZE + SEQ_NUM_SIZE + TIME_STAMP_SIZE + ACK_NUM_SIZE
 
+# Precompiled header layout: channel_type | seq_num | time_stamp | ack_num (big-endian)
+HEADER_STRUCT = struct.Struct('>BHQH')
+assert HEADER_STRUCT.size == HEADER_SIZE
+ACK_NUM_OFFSET = HEADER_SIZE - ACK_NUM_SIZE
+ACK_NUM_STRUCT = struct.Struct('>H')  # patches just the ack_num of a pre-serialized header
+
+# Header + payload layouts specialized per payload length, built on first use. Packing a
+# whole packet is then one C call; the cache is capped since payload lengths are unbounded.
+PACKET_STRUCT_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=PACKET_STRUCT_CACHE_SIZE)
+def _packet_struct(length: int) -> struct.Struct:
+    """Struct packing a full packet whose payload is exactly length bytes."""
+    return struct.Struct(f'>BHQH{length}s')
+
+# Pools of recycled packet objects and serialization buffers
+POOL_SIZE = 256
+MAX_PACKET_SIZE = 1024
+_packet_pool = deque(maxlen=POOL_SIZE)
+_buffer_pool = deque(maxlen=POOL_SIZE)
+
+
+def acquire_buffer() -> bytearray:
+    """Take a serialization buffer from the pool, allocating one if the pool is empty."""
+    try:
+        return _buffer_pool.pop()
+    except IndexError:
+        return bytearray(MAX_PACKET_SIZE)
+
+
+def release_buffer(buf: bytearray) -> None:
+    """Return a serialization buffer to the pool."""
+    _buffer_pool.append(buf)
+
+
+def now_ms() -> int:
+    """Current wall-clock time in integer milliseconds, the unit of the header's time_stamp."""
+    return time.time_ns() // 1_000_000
+
 
 class GameNetPacket:
-    def __init__(self, channel_type=0, seq_num=0, time_stamp=int(time.time() * 1000), ack_num=0, payload=b''):
+    def __init__(self, channel_type=0, seq_num=0, time_stamp=None, ack_num=0, payload=b''):
         self.channel_type = channel_type
         self.seq_num = seq_num
-        self.time_stamp = time_stamp
+        self.time_stamp = now_ms() if time_stamp is None else time_stamp
         self.ack_num = ack_num
         self.payload = payload
 
     def to_bytes(self):
-        header = bytearray(HEADER_SIZE)
-        header[0] = self.channel_type
-        header[1:3] = self.seq_num.to_bytes(2, byteorder='big')
-        header[3:11] = self.time_stamp.to_bytes(8, byteorder='big')
-        header[11:13] = self.ack_num.to_bytes(2, byteorder='big')
-        return bytes(header) + self.payload
+        return _packet_struct(len(self.payload)).pack(
+            self.channel_type, self.seq_num, self.time_stamp, self.ack_num, self.payload)
+
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        """Write header and payload into buf at offset; returns number of bytes written."""
+        packet_struct = _packet_struct(len(self.payload))
+        packet_struct.pack_into(buf, offset, self.channel_type, self.seq_num, self.time_stamp, self.ack_num, self.payload)
+        return packet_struct.size
+
+    @classmethod
+    def acquire(cls, channel_type=0, seq_num=0, time_stamp=None, ack_num=0, payload=b''):
+        """Take a packet from the pool (or create one) and reset its fields in place."""
+        try:
+            packet = _packet_pool.pop()
+        except IndexError:
+            return cls(channel_type, seq_num, time_stamp, ack_num, payload)
+        packet.channel_type = channel_type
+        packet.seq_num = seq_num
+        packet.time_stamp = now_ms() if time_stamp is None else time_stamp
+        packet.ack_num = ack_num
+        packet.payload = payload
+        return packet
+
+    def release(self) -> None:
+        """Return packet to the pool; it must not be used afterwards."""
+        self.payload = b''
+        _packet_pool.append(self)
 
     @classmethod
     def from_bytes(cls, data):
         if len(data) < HEADER_SIZE:
             raise ValueError("Data is too short to contain a valid header")
-        channel_type = data[0]
-        seq_num = int.from_bytes(data[1:3], byteorder='big')
-        time_stamp = int.from_bytes(data[3:11], byteorder='big')
-        ack_num = int.from_bytes(data[11:13], byteorder='big')
-        payload = data[HEADER_SIZE:]
-        return cls(channel_type, seq_num, time_stamp, ack_num, payload)
+        channel_type, seq_num, time_stamp, ack_num = HEADER_STRUCT.unpack_from(data)
+        # data may be a memoryview into a receive buffer: copy just the payload out
+        # (bytes() of an exact bytes slice is a no-op)
+        payload = bytes(data[HEADER_SIZE:])
+        return cls.acquire(channel_type, seq_num, time_stamp, ack_num, payload)
 
     def __repr__(self):
         dt_local = datetime.fromtimestamp(self.time_stamp / 1000)
@@ -1,23 +1,38 @@
 from gameNetAPI import GameNetAPI
+import logging
+import queue
 import time
-from datetime import datetime
+
+PAYLOAD_PREVIEW = 100  # bytes of payload decoded for display
+CHANNEL_NAMES = ("UNRELIABLE", "RELIABLE")  # indexed by channel_type
+
+log = logging.getLogger(__name__)
+
+# Formatting and logging happen on the main thread; the receive thread only enqueues
+print_queue = queue.SimpleQueue()
 
 
 def handle_received_data(packet, latency=None):
-    channel_type = packet.channel_type
-    channel_name = "RELIABLE" if channel_type == 1 else "UNRELIABLE"
-    seq_num = packet.seq_num
-    dt_local = datetime.fromtimestamp(packet.time_stamp / 1000)
-    ack_num = packet.ack_num
-    payload = packet.payload.decode('utf-8') if packet.payload else None
-    
-    print(
-        f"[RECEIVER APPLICATION] Received packet with channel_type: {channel_name} seq_number={seq_num}, "
-        f"timestamp={dt_local.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}, ack_number={ack_num}, "
-        f"latency: {latency:.1f}ms" if latency is not None else "",
-        f"payload: {payload if payload else 'No Payload'}")
+    # packet is recycled once this returns, so copy out the (immutable) fields
+    print_queue.put((packet.channel_type, packet.seq_num, packet.time_stamp,
+                     packet.ack_num, packet.payload, latency))
+
+
+def print_received_data(channel_type, seq_num, time_stamp, ack_num, payload, latency):
+    if not log.isEnabledFor(logging.INFO):
+        return  # skip all formatting when per-packet output is silenced
+    seconds, millis = divmod(time_stamp, 1000)  # time_stamp is integer wall-clock ms
+    payload = payload[:PAYLOAD_PREVIEW].decode('utf-8', errors='replace') if payload else None
+
+    log.info("[RECEIVER APPLICATION] Received packet with channel_type: %s seq_number=%s, "
+             "timestamp=%s.%03d, ack_number=%s, latency: %.1fms payload: %s",
+             CHANNEL_NAMES[channel_type], seq_num, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(seconds)), millis,
+             ack_num, latency or 0.0, payload if payload else 'No Payload')
+
 
 def main():
+    # per-packet protocol logs are DEBUG, delivered packets INFO; WARNING silences both
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("Initializing receiver...")
     server = GameNetAPI(
         mode="server",
@@ -31,34 +46,21 @@ def main():
     server.start()
 
     INACTIVITY_TIMEOUT = 10  # seconds
-    last_packet_time = None
-    first_packet_received = False
-    last_total_packets = 0
     try:
+        # Block until a packet is delivered; the wait is unbounded until the first one arrives
+        wait = None
         while True:
-            total_packets = server.metrics['reliable']['packets_received'] + server.metrics['unreliable']['packets_received']
-            if not first_packet_received and total_packets > 0:
-                first_packet_received = True
-                last_packet_time = time.time()
-                last_total_packets = total_packets
-
-            if first_packet_received:
-                # update last_packet_time on new arrival
-                total_packets = server.metrics['reliable']['packets_received'] + server.metrics['unreliable']['packets_received']
-                if total_packets > last_total_packets:
-                    last_packet_time = time.time()
-                    last_total_packets = total_packets
-
-                # exits if inactivity timeout is reached 
-                if time.time() - last_packet_time > INACTIVITY_TIMEOUT:
-                    print(f"No packets received for {INACTIVITY_TIMEOUT} seconds. Auto-terminating receiver.")
-                    break
-            time.sleep(0.1)
+            print_received_data(*print_queue.get(timeout=wait))
+            wait = INACTIVITY_TIMEOUT
 
+    except queue.Empty:
+        print(f"No packets received for {INACTIVITY_TIMEOUT} seconds. Auto-terminating receiver.")
     except KeyboardInterrupt:
         print("\nShutting down receiver...")
     finally:
         server.close_server()
+        while not print_queue.empty():  # flush whatever is still queued
+            print_received_data(*print_queue.get_nowait())
         print("\nReceiver shutdown complete.")
 
 if __name__ == "__main__":
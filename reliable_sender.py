@@ -1,7 +1,18 @@
+import logging
 import time
-import random
 from gameNetAPI import GameNetAPI
 
+log = logging.getLogger(__name__)
+
+_LINES = None  # gamedata.txt lines as bytes, read once on first use
+
+def _get_lines() -> list[bytes]:
+    global _LINES
+    if _LINES is None:
+        with open('gamedata.txt', 'rb') as file:
+            _LINES = [line.strip() for line in file]
+    return _LINES
+
 def data_to_send(line_num: int) -> tuple[int, bytes]:
     """
     Read a specific line from gamedata.txt and randomly decide reliability.
@@ -11,16 +22,16 @@ def data_to_send(line_num: int) -> tuple[int, bytes]:
     This function always chooses reliable transmission for each line.
     """
     try:
-        with open('gamedata.txt', 'r') as file:
-            lines = file.readlines()
-            if line_num < len(lines):
-                data = lines[line_num].strip()
-                # always reliable transmission, for demonstration purposes
-                channel_type = 1
-                print(f"Line {line_num}: {data} -> {'Reliable' if channel_type == 1 else 'Unreliable'}")
-                return channel_type, data.encode('utf-8')
-            else:
-                return None
+        lines = _get_lines()
+        if line_num < len(lines):
+            data = lines[line_num]
+            # always reliable transmission, for demonstration purposes
+            channel_type = 1
+            if log.isEnabledFor(logging.INFO):
+                log.info("Line %s: %s -> %s", line_num, data.decode('utf-8'), 'Reliable' if channel_type == 1 else 'Unreliable')
+            return channel_type, data
+        else:
+            return None
     except FileNotFoundError:
         print("Error: gamedata.txt not found!")
         return None
@@ -29,6 +40,8 @@ def data_to_send(line_num: int) -> tuple[int, bytes]:
         return None
 
 def main():
+    # per-packet protocol logs are DEBUG; raise verbosity here to see them
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("Initializing sender...")
     
     # Create GameNetAPI in client mode
@@ -45,12 +58,10 @@ def main():
     
     try:
         line_num = 0
-        while True:
+        total_lines = len(_get_lines())
+        while line_num < total_lines:
             result = data_to_send(line_num)
-            if line_num >= len(open('gamedata.txt').readlines()):
-                print("Reached end of file.")
-                break
-            elif result is None:
+            if result is None:
                 print("An error occurred.")
                 break
 
@@ -60,7 +71,11 @@ def main():
             line_num += 1
             # Small delay between sends to avoid overwhelming the receiver
             time.sleep(0.1)
-            
+        else:
+            print("Reached end of file.")
+
+    except FileNotFoundError:
+        print("Error: gamedata.txt not found!")
     except KeyboardInterrupt:
         print("\nSending interrupted by user.")
     finally: